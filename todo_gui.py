@@ -9,17 +9,25 @@ Tkinter Personal To-Do List Application (Final Project)
 - NOW WITH: SF Pro Font, High DPI Awareness, and Web-like Font Sizes
 """
 
+import bisect
+import functools
+import itertools
 import json
 import os
-from dataclasses import dataclass, asdict
+import threading
+from dataclasses import dataclass, field
 from typing import List, Optional
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from datetime import datetime, date
+from datetime import date
 import ctypes # <-- Import ctypes for DPI awareness
 
+try:
+    import orjson  # much faster (de)serialization; optional
+except ImportError:
+    orjson = None
+
 STORE_FILE = "tasks.json"
-DATE_FMT = "%Y-%m-%d"
 DEFAULT_CATEGORIES = ["General", "Work", "Personal", "Urgent"]
 
 # ---------------- Theme ----------------
@@ -44,37 +52,93 @@ PALETTE = {
     "row_overdue":   "#fecaca",  # soft red
 }
 
-def parse_date(raw: str) -> Optional[str]:
-    if not raw:
-        return None
-    raw = raw.strip()
-    if not raw:
+# Font definitions with web-like sizes, bigger + bold; computed once at
+# import instead of per TodoGUI construction.
+FONT_FAMILY_FALLBACKS = ("SF Pro", "Helvetica", "Arial", "sans-serif")
+BASE_FONT          = (FONT_FAMILY_FALLBACKS, 16, "bold")  # Main body text
+LABEL_FONT         = (FONT_FAMILY_FALLBACKS, 15, "bold")  # Form labels
+BUTTON_FONT        = (FONT_FAMILY_FALLBACKS, 16, "bold")  # Buttons
+ACCENT_BUTTON_FONT = (FONT_FAMILY_FALLBACKS, 16, "bold")  # Accent buttons
+HEADER_FONT        = (FONT_FAMILY_FALLBACKS, 15, "bold")  # Table headers
+TREE_FONT          = (FONT_FAMILY_FALLBACKS, 15, "bold")  # Table content
+
+@functools.lru_cache(maxsize=1024)
+def _to_date(yyyy_mm_dd: Optional[str]) -> Optional[date]:
+    """Parse a strict YYYY-MM-DD string via the C-level ISO parser.
+
+    Due dates are low-cardinality strings that get re-parsed on every
+    refresh, so the result is memoized. Pure on its argument; the
+    "days from today" part stays outside the cache (see days_until).
+    """
+    s = yyyy_mm_dd or ""
+    # Length/dash precheck keeps the accepted format strictly YYYY-MM-DD.
+    if len(s) != 10 or s[4] != "-" or s[7] != "-":
         return None
     try:
-        d = datetime.strptime(raw, DATE_FMT).date()
-        return d.strftime(DATE_FMT)
+        return date.fromisoformat(s)
     except ValueError:
         return None
 
-def days_until(yyyy_mm_dd: Optional[str]) -> Optional[int]:
-    if not yyyy_mm_dd:
+def parse_date(raw: str) -> Optional[str]:
+    raw = raw.strip() if raw else ""
+    if _to_date(raw) is None:
         return None
-    try:
-        d = datetime.strptime(yyyy_mm_dd, DATE_FMT).date()
-        return (d - date.today()).days
-    except ValueError:
+    return raw
+
+def days_until(yyyy_mm_dd: Optional[str]) -> Optional[int]:
+    d = _to_date(yyyy_mm_dd)
+    if d is None:
         return None
+    return (d - date.today()).days
+
+_task_ids = itertools.count(1)
 
-@dataclass
+# Ordinal used for "no due date" so undated tasks sort last.
+_NO_DUE_ORD = date.max.toordinal()
+
+@dataclass(slots=True)
 class Task:
     title: str
     description: str
     category: str = "General"
     completed: bool = False
     due_date: Optional[str] = None
+    # Stable identity used as the Treeview iid; never persisted.
+    id: int = field(default_factory=lambda: next(_task_ids))
+    # Parsed due_date, cached so sorting/refresh don't re-parse the string.
+    _due_dt: Optional[date] = field(default=None, compare=False, repr=False)
+    # Lowercased title/description/category, prebuilt so search is one
+    # substring test per task instead of three .lower() calls per keystroke.
+    _search_blob: str = field(default="", compare=False, repr=False)
+    # Sort-key primitives (int ordinal + lowercased strings) cached at
+    # mutation time so comparisons never build dates or lowercase per use.
+    _due_ord: int = field(default=_NO_DUE_ORD, compare=False, repr=False)
+    _cat_lower: str = field(default="", compare=False, repr=False)
+    _title_lower: str = field(default="", compare=False, repr=False)
+
+    def __post_init__(self):
+        self._due_dt = _to_date(self.due_date)
+        self._refresh_search_blob()
+        self._refresh_sort_cache()
+
+    def _refresh_search_blob(self):
+        self._search_blob = f"{self.title}\n{self.description}\n{self.category}".lower()
+
+    def _refresh_sort_cache(self):
+        self._due_ord = self._due_dt.toordinal() if self._due_dt else _NO_DUE_ORD
+        self._cat_lower = self.category.lower()
+        self._title_lower = self.title.lower()
 
     def to_dict(self):
-        return asdict(self)
+        # Only the persisted fields; id and the derived caches stay out.
+        # A literal dict avoids asdict()'s recursion and field introspection.
+        return {
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "completed": self.completed,
+            "due_date": self.due_date,
+        }
 
     @staticmethod
     def from_dict(d):
@@ -86,21 +150,37 @@ class Task:
             due_date=d.get("due_date") or None
         )
 
+def _sort_key(t: Task):
+    """Display order: pending before completed, then due date, category, title."""
+    return (t.completed, t._due_ord, t._cat_lower, t._title_lower)
+
 def load_tasks(filename: str = STORE_FILE) -> List[Task]:
     if not os.path.exists(filename):
         return []
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return [Task.from_dict(x) for x in data]
+        with open(filename, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if isinstance(data, list):
+            return [Task.from_dict(x) for x in data]
     except Exception:
         pass
     return []
 
 def save_tasks(tasks: List[Task], filename: str = STORE_FILE) -> None:
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump([t.to_dict() for t in tasks], f, indent=2, ensure_ascii=False)
+    payload = [t.to_dict() for t in tasks]
+    if orjson is not None:
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+_TCL_SPECIALS = str.maketrans({c: "\\" + c for c in '\\"$[]'})
+
+def _tcl_quote(s) -> str:
+    """Quote a value so it survives literally inside a Tcl script."""
+    return '"' + str(s).translate(_TCL_SPECIALS) + '"'
 
 class TodoGUI(tk.Tk):
     def __init__(self):
@@ -112,8 +192,21 @@ class TodoGUI(tk.Tk):
         self.minsize(1200, 600)
         self._apply_theme()
 
-        self.tasks: List[Task] = load_tasks()
+        # Tasks arrive in batches from _load_async so the window paints
+        # immediately even when the store file is large.
+        self.tasks: List[Task] = []
+        self.task_by_id = {}
+        self._sorted_tasks: List[Task] = []  # kept sorted incrementally
+        # lowercased category -> tasks in display order, so the category
+        # filter is a dict lookup instead of a scan over every task
+        self._by_category: dict = {}
         self.categories = self._derive_categories()
+        self._rendered = {}  # iid -> (values, tags) currently shown in the tree
+        self._tasks_version = 0   # bumped on every task mutation
+        self._last_view_sig = None  # (filters, version, day) last rendered
+        self._dirty = False       # unsaved task mutations pending
+        self._flush_id = None     # pending after() id for the debounced save
+        self._load_complete = False  # all _load_async batches appended; safe to save
 
         # ---------- Top: Add form ----------
         top = ttk.Frame(self, style="Panel.TFrame"); top.pack(fill="x", padx=15, pady=12)
@@ -193,7 +286,10 @@ class TodoGUI(tk.Tk):
         self.bind("<Delete>",       lambda e: self.delete_task())
         self.bind("<Return>",       lambda e: self.mark_completed())
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)  # flush pending save on exit
+
         self.refresh()
+        threading.Thread(target=self._load_async, daemon=True).start()
 
     # -------- DPI Scaling ----------
     def _setup_dpi_awareness(self):
@@ -212,59 +308,57 @@ class TodoGUI(tk.Tk):
     # -------- Theme ----------
     def _apply_theme(self):
         self.configure(bg=PALETTE["bg"])
+        # The combobox popup font is a per-window option, so always set it.
+        self.option_add("*TCombobox*Listbox.font", BASE_FONT)
+
+        # The ttk style DB lives in the Tcl interpreter, and every tk.Tk()
+        # gets a fresh interpreter - so guard per interpreter, not per
+        # process, or a second window would come up unstyled.
+        if self.tk.call("info", "exists", "::todo_gui_themed"):
+            return
+        self.tk.call("set", "::todo_gui_themed", "1")
+
         style = ttk.Style()
         try:
             style.theme_use("clam")
         except tk.TclError:
             pass
 
-        # Font definitions with web-like sizes, now bigger + bold
-        font_family_fallbacks = ("SF Pro", "Helvetica", "Arial", "sans-serif")
-
-        # Increase size and make bold
-        base_font = (font_family_fallbacks, 16, "bold")        # Main body text
-        label_font = (font_family_fallbacks, 15, "bold")       # Form labels
-        button_font = (font_family_fallbacks, 16, "bold")      # Buttons
-        accent_button_font = (font_family_fallbacks, 16, "bold")  # Accent buttons
-        header_font = (font_family_fallbacks, 15, "bold")      # Table headers
-        tree_font = (font_family_fallbacks, 15, "bold")        # Table content
-
-
         style.configure(".",
                         background=PALETTE["panel"],
                         foreground=PALETTE["text"],
-                        font=base_font)
+                        font=BASE_FONT)
 
         style.configure("Panel.TFrame", background=PALETTE["panel"])
 
         style.configure("Label.TLabel",
                         background=PALETTE["panel"],
                         foreground=PALETTE["text"],
-                        font=label_font)
+                        font=LABEL_FONT)
 
         style.configure("Muted.TLabel",
                         background=PALETTE["panel"],
                         foreground=PALETTE["muted"],
-                        font=label_font)
+                        font=LABEL_FONT)
 
         # Increased padding for Entry widgets to match larger fonts
         style.configure("Entry.TEntry",
                         fieldbackground=PALETTE["entry_bg"],
                         foreground=PALETTE["entry_fg"],
                         insertcolor=PALETTE["text"],
-                        font=base_font,
+                        font=BASE_FONT,
                         padding=(8, 6))  # Added padding for better visual appearance
 
         style.configure("TButton",
                         background=PALETTE["panel"],
                         foreground=PALETTE["text"],
-                        font=button_font,
+                        font=BUTTON_FONT,
                         padding=(12, 8))  # Added padding for buttons
 
         style.configure("Accent.TButton",
                         background=PALETTE["accent"],
                         foreground=PALETTE["accent_fg"],
-                        font=accent_button_font,
+                        font=ACCENT_BUTTON_FONT,
                         padding=(12, 8))  # Added padding for accent buttons
 
         # --- CORRECTED COMBOBOX STYLING ---
@@ -276,24 +370,21 @@ class TodoGUI(tk.Tk):
                         arrowcolor=PALETTE["text"],
                         selectbackground=PALETTE["entry_bg"],
                         selectforeground=PALETTE["entry_fg"],
-                        font=base_font,
+                        font=BASE_FONT,
                         padding=(8, 6))
 
-        # Explicitly set the font for the dropdown list part of the combobox
-        self.option_add("*TCombobox*Listbox.font", base_font)
-        # --- END CORRECTION ---
 
         style.configure("Treeview",
                         background=PALETTE["tv_bg"],
                         fieldbackground=PALETTE["tv_bg"],
                         foreground=PALETTE["tv_fg"],
                         rowheight=36,  # Increased row height for larger fonts
-                        font=tree_font)
+                        font=TREE_FONT)
 
         style.configure("Treeview.Heading",
                         background=PALETTE["tv_head_bg"],
                         foreground=PALETTE["tv_head_fg"],
-                        font=header_font,
+                        font=HEADER_FONT,
                         padding=(8, 8))  # Added padding for headers
 
     # -------- Helpers ----------
@@ -308,31 +399,50 @@ class TodoGUI(tk.Tk):
     def _filtered_tasks(self):
         status = self.var_status.get()
         cat = self.var_filter_cat.get()
-        data = self.tasks
+        if cat and cat != "All":
+            data = self._by_category.get(cat.lower(), [])
+        else:
+            data = self._sorted_tasks
         if status == "Completed":
             data = [t for t in data if t.completed]
         elif status == "Pending":
             data = [t for t in data if not t.completed]
-        if cat and cat != "All":
-            data = [t for t in data if t.category.lower() == cat.lower()]
-        def s_key(t: Task):
-            due_key = datetime.max
-            if t.due_date:
-                try:
-                    due_key = datetime.strptime(t.due_date, DATE_FMT)
-                except ValueError:
-                    pass
-            return (t.completed, due_key, t.category.lower(), t.title.lower())
-        return sorted(data, key=s_key)
-
-    def _current_index(self) -> Optional[int]:
-        """Return selected row's original index (iid is the index we inserted)."""
+        q = self.var_search.get().strip().lower()
+        if q:
+            data = [t for t in data if q in t._search_blob]
+        return data
+
+    def _resort_task(self, t: Task, old_cat_key: Optional[str] = None):
+        """Re-slot a task whose sort key (or category) may have changed."""
+        self._sorted_tasks.remove(t)
+        bisect.insort(self._sorted_tasks, t, key=_sort_key)
+        bucket = self._by_category.get(old_cat_key or t._cat_lower)
+        if bucket is not None:
+            try:
+                bucket.remove(t)
+            except ValueError:
+                pass
+        self._index_category(t)
+
+    def _index_category(self, t: Task):
+        bucket = self._by_category.setdefault(t._cat_lower, [])
+        bisect.insort(bucket, t, key=_sort_key)
+
+    def _unindex_category(self, t: Task):
+        bucket = self._by_category.get(t._cat_lower)
+        if bucket is not None:
+            try:
+                bucket.remove(t)
+            except ValueError:
+                pass
+
+    def _current_task(self) -> Optional[Task]:
+        """Return the selected row's Task (iid is the task's id)."""
         sel = self.tree.selection()
         if not sel:
             return None
         try:
-            # The iid we set is a string of the task's original index.
-            return int(sel[0])
+            return self.task_by_id.get(int(sel[0]))
         except (ValueError, IndexError):
             return None
 
@@ -364,40 +474,37 @@ class TodoGUI(tk.Tk):
         if due_raw and not due:
             messagebox.showwarning("Validation", "Invalid Due Date. Use YYYY-MM-DD.")
             return
-        self.tasks.append(Task(title=title, description=desc, category=cat, completed=False, due_date=due))
-        save_tasks(self.tasks)
+        task = Task(title=title, description=desc, category=cat, completed=False, due_date=due)
+        self.tasks.append(task)
+        self.task_by_id[task.id] = task
+        bisect.insort(self._sorted_tasks, task, key=_sort_key)
+        self._index_category(task)
+        self._schedule_save()
         self.var_title.set(""); self.var_desc.set(""); self.var_due.set("")
         self.cat_combo.config(values=self.categories)
         self.filter_combo.config(values=["All"] + self.categories)
         self.refresh()
 
     def mark_completed(self):
-        idx = self._current_index()
-        if idx is None:
+        t = self._current_task()
+        if t is None:
             messagebox.showinfo("Select a task", "Click a task row first, then press Mark Completed.")
             return
-        if 0 <= idx < len(self.tasks):
-            if self.tasks[idx].completed:
-                messagebox.showinfo("Info", "This task is already completed.")
-                return
-            self.tasks[idx].completed = True
-            save_tasks(self.tasks)
-            self.refresh()
-        else:
-             messagebox.showerror("Error", "Selected task index is out of range.")
-
+        if t.completed:
+            messagebox.showinfo("Info", "This task is already completed.")
+            return
+        t.completed = True
+        self._resort_task(t)
+        self._schedule_save()
+        self.refresh()
 
     def edit_task(self):
-        idx = self._current_index()
-        if idx is None:
+        t = self._current_task()
+        if t is None:
             messagebox.showinfo("Select a task", "Click a task row first, then press Edit.")
             return
 
-        if not (0 <= idx < len(self.tasks)):
-            messagebox.showerror("Error", "Invalid task selected.")
-            return
-
-        t = self.tasks[idx]
+        old_cat_key = t.category.lower()
         new_title = simpledialog.askstring("Edit Title", "Title:", initialvalue=t.title)
         if new_title is not None and new_title.strip():
             t.title = new_title.strip()
@@ -421,58 +528,115 @@ class TodoGUI(tk.Tk):
                     t.due_date = parsed
                 else:
                     messagebox.showwarning("Validation", "Invalid date. Keeping existing due date.")
-        save_tasks(self.tasks)
+            t._due_dt = _to_date(t.due_date)
+        t._refresh_search_blob()
+        t._refresh_sort_cache()
+        self._resort_task(t, old_cat_key)
+        self._schedule_save()
         self.cat_combo.config(values=self.categories)
         self.filter_combo.config(values=["All"] + self.categories)
         self.refresh()
 
     def delete_task(self):
-        idx = self._current_index()
-        if idx is None:
+        t = self._current_task()
+        if t is None:
             messagebox.showinfo("Select a task", "Click a task row first, then press Delete.")
             return
 
-        if not (0 <= idx < len(self.tasks)):
-            messagebox.showerror("Error", "Invalid task selected.")
-            return
-
-        t = self.tasks[idx]
         if messagebox.askyesno("Confirm", f"Delete '{t.title}'?"):
-            self.tasks.pop(idx)
-            save_tasks(self.tasks)
+            self.tasks.remove(t)
+            self._sorted_tasks.remove(t)
+            self._unindex_category(t)
+            del self.task_by_id[t.id]
+            self._schedule_save()
             self.refresh()
 
     def clear_filters(self):
         self.var_status.set("All")
         self.var_filter_cat.set("All")
+        self.var_search.set("")
+        self.refresh()
+
+    # -------- Persistence ----------
+    def _load_async(self):
+        """Read and parse the store off the UI thread, then hand the tasks
+        to Tk in batches so the first paint never blocks on file size."""
+        tasks = load_tasks()
+        try:
+            for i in range(0, len(tasks), 500):
+                self.after(0, self._append_batch, tasks[i:i + 500])
+            self.after(0, self._finish_load)
+        except (tk.TclError, RuntimeError):
+            # Window destroyed before the read finished; nothing to show.
+            pass
+
+    def _finish_load(self):
+        # Runs after the last batch; saving is safe from here on.
+        self._load_complete = True
+
+    def _append_batch(self, batch: List[Task]):
+        for t in batch:
+            self.tasks.append(t)
+            self.task_by_id[t.id] = t
+            bisect.insort(self._sorted_tasks, t, key=_sort_key)
+            self._index_category(t)
+        new_cats = [c for c in sorted({t.category for t in batch if t.category})
+                    if c not in self.categories]
+        if new_cats:
+            self.categories.extend(new_cats)
+            self.cat_combo.config(values=self.categories)
+            self.filter_combo.config(values=["All"] + self.categories)
+        self._tasks_version += 1  # re-render, but nothing new to save
         self.refresh()
 
+    def _schedule_save(self):
+        """Mark tasks dirty and coalesce rapid mutations into one disk write."""
+        self._tasks_version += 1
+        self._dirty = True
+        if self._flush_id is None:
+            self._flush_id = self.after(250, self._flush)
+
+    def _flush(self):
+        self._flush_id = None
+        if not self._load_complete:
+            # Batches are still streaming in; writing self.tasks now would
+            # overwrite the store with a partial list. Retry shortly.
+            self._flush_id = self.after(250, self._flush)
+            return
+        if self._dirty:
+            save_tasks(self.tasks)
+            self._dirty = False
+
+    def _on_close(self):
+        if self._dirty and not self._load_complete:
+            # Hold the window until the remaining batches arrive so the
+            # final flush can't truncate the store.
+            self.after(50, self._on_close)
+            return
+        if self._flush_id is not None:
+            self.after_cancel(self._flush_id)
+            self._flush_id = None
+        self._flush()
+        self.destroy()
+
     # -------- Render ----------
     def refresh(self):
-        # clear list
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # map tasks to original indices (handles duplicates)
-        from collections import defaultdict, deque
-        key_map = defaultdict(deque)
-        for i, t in enumerate(self.tasks):
-            key_map[(t.title, t.description, t.category, t.completed, t.due_date)].append(i)
+        today_ord = date.today().toordinal()  # once per refresh, not per row
+
+        # Nothing to do if neither the filters, the tasks, nor the calendar
+        # day changed since the last render.
+        sig = (self.var_status.get(), self.var_filter_cat.get(),
+               self.var_search.get().strip().lower(),
+               self._tasks_version, today_ord)
+        if sig == self._last_view_sig:
+            return
+        self._last_view_sig = sig
 
+        desired = []  # ordered (iid, values, tags)
         for t in self._filtered_tasks():
-            key = (t.title, t.description, t.category, t.completed, t.due_date)
-            try:
-                orig_idx = key_map[key].popleft()
-            except IndexError:
-                # Fallback just in case, though it should not happen with this logic
-                try:
-                    orig_idx = self.tasks.index(t)
-                except ValueError:
-                    continue # Should not happen
-
             due_text = t.due_date or "-"
             hint = ""
-            eta = days_until(t.due_date)
+            eta = t._due_ord - today_ord if t._due_dt else None
             tags = []
             if t.completed:
                 tags.append("completed")
@@ -486,9 +650,59 @@ class TodoGUI(tk.Tk):
                         hint = f"in {eta}d"; tags.append("due_soon")
 
             status = "✓ Completed" if t.completed else "• Pending"
-            self.tree.insert("", "end", iid=str(orig_idx),
-                             values=(status, t.title, t.category, due_text, hint, t.description),
-                             tags=tuple(tags))
+            desired.append((str(t.id),
+                            (status, t.title, t.category, due_text, hint, t.description),
+                            tuple(tags)))
+
+        self._render_rows(desired)
+
+    def _render_rows(self, desired):
+        """Sync the Treeview to `desired` by diffing against what's on screen.
+
+        Only rows that actually changed get a Tk call (item/insert/delete/
+        move), so a refresh after a single edit costs O(changes) instead of
+        rebuilding every row.
+        """
+        rendered = self._rendered
+        desired_iids = {iid for iid, _, _ in desired}
+        doomed = [i for i in rendered if i not in desired_iids]
+
+        # For big structural batches, blank the columns so Tk repaints once
+        # on restore instead of re-laying-out after every insert/delete.
+        batch = len(doomed) + len(desired_iids - rendered.keys()) > 50
+        if batch:
+            self.tree.configure(displaycolumns=())
+        try:
+            for iid in doomed:
+                self.tree.delete(iid)
+                del rendered[iid]
+
+            # New rows are appended through one Tcl script instead of one
+            # wrapped insert() call each; the move pass below puts them in place.
+            tree_path = str(self.tree)
+            inserts = []
+            for iid, values, tags in desired:
+                prev = rendered.get(iid)
+                if prev is None:
+                    inserts.append("%s insert {} end -id %s -values [list %s] -tags [list %s]" % (
+                        tree_path, _tcl_quote(iid),
+                        " ".join(_tcl_quote(v) for v in values),
+                        " ".join(_tcl_quote(x) for x in tags)))
+                    rendered[iid] = (values, tags)
+                elif prev != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+                    rendered[iid] = (values, tags)
+            if inserts:
+                self.tk.eval("\n".join(inserts))
+
+            # fix ordering only if it drifted
+            order = [iid for iid, _, _ in desired]
+            if list(self.tree.get_children("")) != order:
+                for pos, iid in enumerate(order):
+                    self.tree.move(iid, "", pos)
+        finally:
+            if batch:
+                self.tree.configure(displaycolumns="#all")
 
 def main():
     app = TodoGUI()